@@ -11,145 +11,540 @@ Provides the SiteCharacterization class.
 """
 #import copy
 #import fnmatch
-#import warnings
+import os
+import sys
+import warnings
 
-#import numpy as np
+from lxml import etree
+import numpy as np
 
 #from obspy import UTCDateTime
+from obspy.core.util import Enum
 from obspy.core.util.base import ComparingObject
+from obspy.core.util.deprecation_helpers import ObsPyDeprecationWarning
 #from obspy.core.util.obspy_types import (ObsPyException, ZeroSamplingRate,
 #                                         FloatWithUncertaintiesAndUnit)
 #from obspy.core.event import ResourceIdentifier
-from obspy.core.inventory.sitexml_header import (TopographySchemaA, TopographySchemaB, 
-                                                 _sitexml_check_type, _sitexml_check_enum)
+from obspy.core.inventory.sitexml_header import (TopographySchemaA, TopographySchemaB,
+                                                 _enum_members, _sitexml_enum_error,
+                                                 _sitexml_type_error, _TYPE_NAMES)
+from obspy.core.inventory.sitexml_kernels import (_resonance_frequency, _vs30)
 #from obspy.geodetics import inside_geobounds
 
 #from .util import (BaseNode, Equipment, Operator, Distance, Latitude,
 #                   Longitude, Site, _unified_content_strings_expanded)
 
 
-class SERASite(ComparingObject):
+# Immutable default for the collection-valued attributes below; sharing one
+# tuple avoids allocating a fresh empty list per instance.
+_EMPTY = ()
+
+_SITEXML_SCHEMA_PATH = os.path.join(os.path.dirname(__file__), 'data',
+                                    'sitexml.xsd')
+_sitexml_schema_cache = {}
+
+
+def _get_sitexml_schema():
+    """
+    Returns the compiled SiteXML schema, compiling it once on first use.
+
+    The schema is loaded from the packaged ``data/sitexml.xsd`` rather than
+    fetched from the network. The compiled
+    :class:`lxml.etree.XMLSchema` object -- or the absence of one -- is
+    cached per schema path, so parsing many files neither recompiles the
+    schema nor re-stats a missing file. Returns ``None`` if the schema
+    file is not shipped.
+    """
+    path = _SITEXML_SCHEMA_PATH
+    try:
+        return _sitexml_schema_cache[path]
+    except KeyError:
+        schema = None
+        if os.path.exists(path):
+            schema = etree.XMLSchema(etree.parse(path))
+        _sitexml_schema_cache[path] = schema
+        return schema
+
+
+def parse_sitexml(source):
+    """
+    Parses a SiteXML document, validating it against the packaged schema
+    while parsing.
+
+    :param source: File name or file-like object.
+    :rtype: :class:`lxml.etree._ElementTree`
+    :returns: The parsed document tree. If the packaged schema is
+        available, documents that do not validate against it fail with
+        :class:`lxml.etree.XMLSyntaxError`.
+    """
+    parser = etree.XMLParser(schema=_get_sitexml_schema(), huge_tree=True)
+    return etree.parse(source, parser=parser)
+
+
+def _make_init(class_name, fields, doc=None):
+    """
+    Generates a straight-line ``__init__`` for one of the SiteXML value
+    classes.
+
+    The hand-written constructors in this module all follow the same pattern:
+    assign every parameter to the attribute of the same name, running it
+    through ``_sitexml_check_type``/``_sitexml_check_enum`` where a specific
+    type or enum is required. Going through those helpers costs one Python
+    frame plus argument handling per field on every construction, which adds
+    up when thousands of objects are built while ingesting a large inventory.
+    This helper instead compiles the whole constructor once per class with
+    all checks inlined, so a successful construction runs straight-line
+    bytecode without any helper calls.
+
+    :type class_name: str
+    :param class_name: Name of the class the ``__init__`` is generated for.
+    :type fields: tuple
+    :param fields: One ``(name, required, check)`` triple per parameter, in
+        signature order. Required parameters have no default, all others
+        default to ``None``. ``check`` is ``None`` for a plain assignment, a
+        class for an isinstance check (``None`` remains allowed), an
+        :class:`~obspy.core.util.obspy_types.Enum` for a membership check, or
+        the ``tuple`` builtin to substitute the shared empty tuple for a
+        missing value, or the ``property`` builtin for parameters that are
+        only accepted (with a deprecation warning) for API compatibility
+        because the attribute is now derived.
+    :type doc: str, optional
+    :param doc: Docstring to attach to the generated ``__init__``.
+    """
+    args = ["self"]
+    lines = []
+    namespace = {
+        '_sitexml_type_error': _sitexml_type_error,
+        '_sitexml_enum_error': _sitexml_enum_error,
+        '_EMPTY': _EMPTY,
+        '_warn': warnings.warn,
+        '_DeprecationWarning': ObsPyDeprecationWarning,
+    }
+    for name, required, check in fields:
+        args.append(name if required else name + "=None")
+        if check is None:
+            pass
+        elif check is property:
+            message = ("'%s' is now derived and the argument is ignored."
+                       % (name, ))
+            lines.append(f"    if {name} is not None:")
+            lines.append(
+                f"        _warn({message!r}, _DeprecationWarning)")
+            continue
+        elif check is tuple:
+            # Shared empty-tuple default: no fresh list is allocated for
+            # the (common) records without entries. Callers that want to
+            # mutate the attribute afterwards must pass an explicit list.
+            lines.append(
+                f"    self.{name} = {name} "
+                f"if {name} is not None else _EMPTY")
+            continue
+        elif isinstance(check, Enum):
+            enum_name = "_enum_" + name
+            members_name = "_members_" + name
+            namespace[enum_name] = check
+            namespace[members_name] = _enum_members(check)
+            lines.append(
+                f"    if {name} is not None and "
+                f"{name}.lower() not in {members_name}:")
+            lines.append(
+                f"        raise ValueError("
+                f"_sitexml_enum_error({name!r}, {enum_name}, {name}))")
+        else:
+            type_name = "_type_" + name
+            namespace[type_name] = check
+            lines.append(
+                f"    if {name} is not None and "
+                f"not isinstance({name}, {type_name}):")
+            lines.append(
+                f"        raise TypeError("
+                f"_sitexml_type_error({name!r}, {type_name}, {name}))")
+        lines.append(f"    self.{name} = {name}")
+    source = "def __init__({}):\n{}\n".format(", ".join(args),
+                                              "\n".join(lines))
+    exec(compile(source, f"<generated {class_name}.__init__>", "exec"),
+         namespace)
+    init = namespace['__init__']
+    init.__qualname__ = class_name + ".__init__"
+    init.__doc__ = doc
+    return init
+
+
+class _SlottedComparingObject(object):
+    """
+    Base class for the slotted value classes of this module, implementing
+    == and != like :class:`~obspy.core.util.base.ComparingObject` but on
+    the attributes declared in ``__slots__``.
+
+    Unlike deriving from ``ComparingObject`` directly, this base defines
+    ``__slots__`` itself, so subclasses with ``__slots__`` really have no
+    per-instance ``__dict__``: their state lives at fixed offsets only and
+    a typo'd attribute write raises ``AttributeError`` instead of landing
+    in a dict silently.
+    """
+    __slots__ = ()
+
+    def _get_comparison_dict(self):
+        state = {}
+        for cls in type(self).__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                try:
+                    state[name] = getattr(self, name)
+                except AttributeError:
+                    continue
+        return state
+
+    def __eq__(self, other):
+        return (isinstance(other, self.__class__) and
+                self._get_comparison_dict() == other._get_comparison_dict())
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+
+# Shared, interned name constants for the SiteIndicator subclasses. Every
+# instance points at the same string object, so a large inventory stores
+# each name once and name comparisons short-circuit to pointer compares.
+_NAME_H800 = sys.intern("H800")
+_NAME_EC8 = sys.intern("EC8")
+_NAME_BEDROCK_DEPTH = sys.intern("bedrock_depth")
+_NAME_GEOLOGICAL_UNIT = sys.intern("geological_unit")
+_NAME_RESONANCE_FREQUENCY = sys.intern("resonance_frequency")
+_NAME_VELOCITY_S30 = sys.intern("velocity_s30")
+
+
+class SERASite(_SlottedComparingObject):
     """
     This is the parent class for the siteXML object tree.
     """
-    def __init__(self, station_code, site_description=None, site_characterization_parameters=None, overall_quality_index=None):
+    __slots__ = ('station_code', 'site_description',
+                 'site_characterization_parameters', 'overall_quality_index')
+
+def _set_text_element(parent, tag, value):
+    """
+    Appends ``<tag>value</tag>`` to ``parent``, skipping ``None`` values.
+    """
+    if value is None:
+        return
+    etree.SubElement(parent, tag).text = str(value)
+
+
+def _serialize_literature_source(parent, source):
+    """
+    Appends the element for a LiteratureSource to ``parent``, skipping
+    ``None`` sources.
+    """
+    if source is None:
+        return
+    elem = etree.SubElement(parent, 'LiteratureSource')
+    _set_text_element(elem, 'Title', source.title)
+    _set_text_element(elem, 'FirstAuthor', source.firstAuthor)
+    _set_text_element(elem, 'SecondaryAuthors', source.secondaryAuthors)
+    _set_text_element(elem, 'Year', source.year)
+    _set_text_element(elem, 'Booktitle', source.booktitle)
+    _set_text_element(elem, 'Language', source.language)
+    _set_text_element(elem, 'DOI', source.DOI)
+
+
+def _serialize_indicator(parent, tag, indicator):
+    """
+    Appends the element for a SiteIndicator to ``parent``, skipping
+    ``None`` indicators.
+    """
+    if indicator is None:
+        return
+    elem = etree.SubElement(parent, tag)
+    if indicator.uncertainty is not None:
+        elem.set('uncertainty', str(indicator.uncertainty))
+    if indicator.quality_index is not None:
+        elem.set('qualityIndex', str(indicator.quality_index))
+    _set_text_element(elem, 'Value', indicator.value)
+    for method in indicator.methods:
+        _set_text_element(elem, 'Method', method)
+    _serialize_literature_source(elem, indicator.literature_source)
+    _set_text_element(elem, 'ExternalReference',
+                      indicator.external_reference)
+    # Subclass-only fields.
+    if isinstance(indicator, GeologicalUnit):
+        _set_text_element(elem, 'GeologicalMapScale',
+                          indicator.geological_map_scale)
+        _set_text_element(elem, 'GeologicalUnitOGE',
+                          indicator.geological_unit_OGE)
+    elif isinstance(indicator, velocityS30):
+        _set_text_element(elem, 'MethodCombinedQualityIndex',
+                          indicator.method_combined_quality_index)
+        _set_text_element(elem, 'ManualQualityIndex',
+                          indicator.manual_quality_index)
+
+
+def _serialize_site(site):
+    """
+    Builds the ``<Site>`` element for a single
+    :class:`~obspy.core.inventory.sitexml.SERASite`.
+    """
+    elem = etree.Element('Site')
+    if site.station_code is not None:
+        elem.set('stationCode', site.station_code)
+    if site.overall_quality_index is not None:
+        elem.set('overallQualityIndex', str(site.overall_quality_index))
+    description = site.site_description
+    if description is not None:
+        sub = etree.SubElement(elem, 'SiteDescription')
+        _set_text_element(sub, 'Latitude', description.latitude)
+        _set_text_element(sub, 'Longitude', description.longitude)
+        _set_text_element(sub, 'Altitude', description.altitude)
+        _set_text_element(sub, 'MinDistanceFromStation',
+                          description.minDistanceFromStation)
+        _set_text_element(sub, 'MaxDistanceFromStation',
+                          description.maxDistanceFromStation)
+        _serialize_indicator(sub, 'EC8', description.EC8)
+        _serialize_indicator(sub, 'BedrockDepth', description.bedrock_depth)
+        _serialize_indicator(sub, 'H800', description.H800)
+        _serialize_indicator(sub, 'GeologicalUnit',
+                             description.geological_unit)
+        _set_text_element(sub, 'Morphology', description.morphology)
+        _set_text_element(sub, 'TopographySchemaA', description.topologyA)
+        _set_text_element(sub, 'TopographySchemaB', description.topologyB)
+    parameters = site.site_characterization_parameters
+    if parameters is not None:
+        sub = etree.SubElement(elem, 'SiteCharacterizationParameters')
+        if parameters.publicID is not None:
+            sub.set('publicID', str(parameters.publicID))
+        if parameters.analysis_publicID is not None:
+            sub.set('analysisPublicID', str(parameters.analysis_publicID))
+        _serialize_indicator(sub, 'ResonanceFrequency',
+                             parameters.resonance_frequency)
+        _serialize_indicator(sub, 'VelocityS30', parameters.velocity_s30)
+        _set_text_element(sub, 'SptLogsCount', parameters.spt_logs_count)
+        _set_text_element(sub, 'CptLogsCount', parameters.cpt_logs_count)
+        _set_text_element(sub, 'BoreholeLogsCount',
+                          parameters.borehole_logs_count)
+        for profile in parameters.velocity_profile:
+            profile_elem = etree.SubElement(sub, 'VelocityProfile')
+            for layer in profile.velocity_profile_data:
+                layer_elem = etree.SubElement(profile_elem, 'Layer')
+                _set_text_element(layer_elem, 'Density', layer.density)
+                _set_text_element(layer_elem, 'VelocityP', layer.velocityP)
+                _set_text_element(layer_elem, 'VelocityS', layer.velocityS)
+                _set_text_element(layer_elem, 'LayerTopDepth',
+                                  layer.layerTopDepth)
+                _set_text_element(layer_elem, 'LayerBottomDepth',
+                                  layer.layerBottomDepth)
+    return elem
+
+
+def to_xml_stream(sera_site_iterable, out_path):
+    """
+    Writes an iterable of :class:`~obspy.core.inventory.sitexml.SERASite`
+    objects to a SiteXML file incrementally.
+
+    Each site is serialized and written through lxml's incremental
+    ``xmlfile`` writer as soon as it is produced, so peak memory stays at
+    one site regardless of how many sites the iterable yields, and the
+    iterable may well be a generator.
+
+    :type sera_site_iterable: iterable of
+        :class:`~obspy.core.inventory.sitexml.SERASite`
+    :param sera_site_iterable: The sites to write.
+    :param out_path: File name or file-like object to write to.
+    """
+    with etree.xmlfile(out_path, encoding='utf-8', buffered=True) as xf:
+        xf.write_declaration()
+        with xf.element('SiteXML'):
+            for site in sera_site_iterable:
+                xf.write(_serialize_site(site))
+
+
+class SiteDescription(_SlottedComparingObject):
+    __slots__ = ('latitude', 'longitude', 'altitude', 'minDistanceFromStation',
+                 'maxDistanceFromStation', 'EC8', 'bedrock_depth', 'H800',
+                 'geological_unit', 'morphology', 'topologyA', 'topologyB')
+
+class SiteCharacterizationParameters(_SlottedComparingObject):
+    __slots__ = ('publicID', 'analysis_publicID', 'resonance_frequency',
+                 'velocity_s30', 'velocity_profile',
+                 'spt_logs_count', 'cpt_logs_count', 'borehole_logs_count')
+
+    @property
+    def velocity_profile_count(self):
         """
-        :type station_code: str
-        :param station_code: Not used in SiteXML, but is needed in order to correlate with the Station Object
-        :type site_description: :class:`~obspy.core.inventory.sitexml.SiteDescription`
-        :param analysis_publicID: The site description parameters (H800, Bedrock depth, EC8 class, geological unit, morphology, topology)
-        :type site_characterization_parameters: :class:`~obspy.core.inventory.sitexml.SiteCharacterizationParameters`
-        :param site_characterization_parameters: The site characterization parameters (VS30, resonance frequency, velocity profiles)
-        :type overall_quality_index: float
-        :param overall_quality_index: The overall quality index of the site characterization parameters.
+        Number of available velocity profiles, derived from
+        ``velocity_profile``.
         """
-        self.station_code = station_code
-        
-        self.site_description = _sitexml_check_type(
-            site_description, SiteDescription, "site_description", True)
-
-        self.site_characterization_parameters = _sitexml_check_type(
-            site_characterization_parameters, SiteCharacterizationParameters, "site_characterization_parameters", True)
-        
-        # TO CHECK: If this one is calculated it should be removed from the parameters 
-        self.overall_quality_index = overall_quality_index
-       
-class SiteDescription(ComparingObject):
-    def __init__(self, latitude, longitude, altitude=None, minDistanceFromStation=None, maxDistanceFromStation=None, 
-                 EC8=None, bedrock_depth=None, H800=None, geological_unit=None, morphology=None, topologyA=None, topologyB=None):
+        return len(self.velocity_profile)
+
+    def compute_vs30(self, profile_index=0):
         """
-        :type latitude: :class:`~obspy.core.inventory.util.Latitude`
-        :param latitude: The latitude of the site
-        :type longitude: :class:`~obspy.core.inventory.util.Longitude`
-        :param longitude: The longitude of the site
-        :type altitude: float (maybe CustomFloat??)
-        :param altitude: Elevation of ground with respect to sea level (m)
-        :type minDistanceFromStation: float (maybe CustomFloat??)
-        :param minDistanceFromStation: Minimum distance between the permanent seismological station and 
-            site characterization measurement. Should be used only when representative latitude and longitude 
-            of site characterization measurements cannot be provided.
-        :type maxDistanceFromStation: float (maybe CustomFloat??)
-        :param maxDistanceFromStation: Maximum distance between the permanent seismological station and 
-            site characterization measurement. Should be used only when representative latitude and longitude 
-            of site characterization measurements cannot be provided.
-        :type EC8: :class:`~obspy.core.inventory.sitexml.EC8`
-        :param EC8: Ground type according to Eurocode 8, based on the velocity S30 value and geotechnical description
-        :type H800: :class:`~obspy.core.inventory.sitexml.H800`
-        :param H800: Depth beyond which the shear-wave velocity Vs exceeds 800 m/s.
-        :type bedrock_depth: :class:`~obspy.core.inventory.sitexml.BedrockDepth`
-        :param bedrock_depth: 
-        :type geological_unit: str
-        :param geological_unit: Brief description of the surface geology (free text)
-        :type morphology: str (Enum)
-        :param morphology: Qualitative description of the shape of the earth's surface
-        :type topologyA: str
-        :param topologyA: Quantitative description of the surface according to the Italian Code 
-            (detailed description of the scheme in SERA Deliverable D7.1 - Appendix I).
-            See :class:`~obspy.core.inventory.sitexml_header.TopographySchemaA` for allowed values.
-        :type topologyB: str
-        :param topologyB: Quantitative description of the shape of the earth's surface according to 
-            Burjanek et al, 2014 (detailed description of the scheme in SERA Deliverable D7.1 - Appendix I). 
-            See :class:`~obspy.core.inventory.sitexml_header.TopographySchemaB` for allowed values.
+        Computes the time-averaged shear-wave velocity over the top 30 m
+        from one of the attached velocity profiles.
+
+        :type profile_index: int
+        :param profile_index: Index into ``velocity_profile``, defaults to
+            the first profile.
+        :rtype: float
+        :returns: Vs30 in the units of the profile velocities, ``nan`` if
+            the profile contains no usable layer.
         """
-        # Topology and topography have the same meaning ?
-        self.latitude = latitude
-        self.longitude = longitude
-        self.altitude = altitude
-        self.minDistanceFromStation = minDistanceFromStation
-        self.maxDistanceFromStation = maxDistanceFromStation
-
-        self.EC8 = _sitexml_check_type(EC8, EC8_class, "EC8", True)
-        self.bedrock_depth = _sitexml_check_type(bedrock_depth, BedrockDepth, "bedrock_depth", True)
-        self.H800 = _sitexml_check_type(H800, H800_class, "H800", True)
-        self.geological_unit = _sitexml_check_type(geological_unit, GeologicalUnit, "geological_unit", True)
-        
-        self.morphology = morphology
-        
-        self.topologyA = _sitexml_check_enum(topologyA, TopographySchemaA, "topologyA", True)
-        self.topologyB = _sitexml_check_enum(topologyB, TopographySchemaB, "topologyB", True)
-
-class SiteCharacterizationParameters(ComparingObject):
-    def __init__(self, publicID=None, analysis_publicID=None, resonance_frequency=None, velocity_s30=None, 
-                 velocity_profile_count=None, velocity_profile=None, spt_logs_count=None, cpt_logs_count=None, 
-                 borehole_logs_count=None):
+        return _vs30(*self.velocity_profile[profile_index]._kernel_columns())
+
+    def compute_resonance_frequency(self, profile_index=0):
         """
-        :type publicID: :class:`~obspy.core.event.resourceid.ResourceIdentifier`
-        :param publicID: All channels belonging to this station.
-        :type analysis_publicID: :class:`~obspy.core.event.resourceid.ResourceIdentifier`
-        :param analysis_publicID: The lexical description of the site
-        :type resonance_frequency: :class:`~obspy.core.inventory.sitexml.ResonanceFrequency`
-        :param resonance_frequency: The Resonance frequency of the soil column 
-        :type velocity_s30: :class:`~obspy.core.inventory.sitexml.velocityS30`
-        :param velocity_s30: Average shear-wave velocity between 0 and 30 meters depth
-        :type velocity_profile_count: int
-        :param velocity_profile_count: Number of available velocity profiles
-        :type velocity_profile: list of :class:`~obspy.core.inventory.sitexml.VelocityProfile`
-        :param velocity_profile: List of velocity profiles
-        :type spt_logs_count: int
-        :param spt_logs_count: Number of available SPT profile(s)
-        :type cpt_logs_count: int
-        :param cpt_logs_count: Number of available CPT profile(s)
-        :type borehole_logs_count: int
-        :param borehole_logs_count: Number of available borehole log profile(s)
-       """
-        self.publicID = publicID        
-        self.analysis_publicID = analysis_publicID   
-        self.resonance_frequency = _sitexml_check_type(resonance_frequency, ResonanceFrequency, "resonance_frequency", True)
-        self.velocity_s30 = _sitexml_check_type(velocity_s30, velocityS30, "velocity_s30", True)
-        self.velocity_profile_count = velocity_profile_count
-        self.velocity_profile = velocity_profile or []
-        self.spt_logs_count = spt_logs_count
-        self.cpt_logs_count = cpt_logs_count
-        self.borehole_logs_count = borehole_logs_count
-        
-class VelocityProfile(ComparingObject):
-    def __init__(self, layer_count, velocity_profile_data):
-        self.layer_count = layer_count
-        self.velocity_profile_data = velocity_profile_data
-                 
-class VelocityProfileData(ComparingObject):
+        Computes the fundamental resonance frequency of the soil column of
+        one of the attached velocity profiles, using the quarter-wavelength
+        approximation.
+
+        :type profile_index: int
+        :param profile_index: Index into ``velocity_profile``, defaults to
+            the first profile.
+        :rtype: float
+        :returns: Resonance frequency in Hz, ``nan`` if the profile
+            contains no usable layer.
+        """
+        return _resonance_frequency(
+            *self.velocity_profile[profile_index]._kernel_columns())
+
+class VelocityProfile(_SlottedComparingObject):
+    """
+    A velocity profile, stored column-wise.
+
+    The per-layer values are kept as five parallel :class:`numpy.ndarray`
+    columns rather than one Python object per layer, so that integrations
+    over the profile (Vs30, travel times, resonance) run as vectorized
+    NumPy operations instead of per-layer attribute lookups.
+    """
+    __slots__ = ('_cols', )
+
+    _COLUMNS = ('density', 'velocityP', 'velocityS', 'layerTopDepth',
+                'layerBottomDepth')
+
+    def __init__(self, layer_count=None, velocity_profile_data=None,
+                 density=None, velocityP=None, velocityS=None,
+                 layerTopDepth=None, layerBottomDepth=None,
+                 dtype=np.float64):
+        """
+        :type layer_count: int
+        :param layer_count: Deprecated and ignored; the count is derived
+            from the stored columns.
+        :type velocity_profile_data: list of
+            :class:`~obspy.core.inventory.sitexml.VelocityProfileData`
+        :param velocity_profile_data: Per-layer values as objects; converted
+            to columns internally. Mutually exclusive with passing the five
+            columns directly.
+        :type density: :class:`numpy.ndarray` or list of float
+        :param density: Density column, one value per layer.
+        :type velocityP: :class:`numpy.ndarray` or list of float
+        :param velocityP: P-wave velocity column, one value per layer.
+        :type velocityS: :class:`numpy.ndarray` or list of float
+        :param velocityS: S-wave velocity column, one value per layer.
+        :type layerTopDepth: :class:`numpy.ndarray` or list of float
+        :param layerTopDepth: Depth of the top of each layer.
+        :type layerBottomDepth: :class:`numpy.ndarray` or list of float
+        :param layerBottomDepth: Depth of the bottom of each layer.
+        :type dtype: :class:`numpy.dtype`
+        :param dtype: dtype of the stored columns, defaults to float64; pass
+            ``np.float32`` to halve the memory footprint.
+        """
+        if layer_count is not None:
+            warnings.warn("'layer_count' is now derived and the argument "
+                          "is ignored.", ObsPyDeprecationWarning)
+        if velocity_profile_data is not None:
+            if any(column is not None for column in (
+                    density, velocityP, velocityS, layerTopDepth,
+                    layerBottomDepth)):
+                raise TypeError(
+                    "Pass either 'velocity_profile_data' or the five column "
+                    "arrays, not both.")
+            density = [layer.density for layer in velocity_profile_data]
+            velocityP = [layer.velocityP for layer in velocity_profile_data]
+            velocityS = [layer.velocityS for layer in velocity_profile_data]
+            layerTopDepth = [
+                layer.layerTopDepth for layer in velocity_profile_data]
+            layerBottomDepth = [
+                layer.layerBottomDepth for layer in velocity_profile_data]
+        self._cols = {
+            'density': np.asarray(
+                density if density is not None else [], dtype=dtype),
+            'velocityP': np.asarray(
+                velocityP if velocityP is not None else [], dtype=dtype),
+            'velocityS': np.asarray(
+                velocityS if velocityS is not None else [], dtype=dtype),
+            'layerTopDepth': np.asarray(
+                layerTopDepth if layerTopDepth is not None else [],
+                dtype=dtype),
+            'layerBottomDepth': np.asarray(
+                layerBottomDepth if layerBottomDepth is not None else [],
+                dtype=dtype),
+        }
+        lengths = {name: column.shape[0]
+                   for name, column in self._cols.items()}
+        if len(set(lengths.values())) > 1:
+            raise ValueError(
+                "All velocity profile columns must have the same length, "
+                "got %s." % (lengths, ))
+
+    @property
+    def layer_count(self):
+        """
+        Number of layers in the profile, derived from the stored columns.
+        """
+        return len(self._cols['velocityS'])
+
+    density = property(
+        lambda self: self._cols['density'],
+        doc="Density column as :class:`numpy.ndarray`.")
+    velocityP = property(
+        lambda self: self._cols['velocityP'],
+        doc="P-wave velocity column as :class:`numpy.ndarray`.")
+    velocityS = property(
+        lambda self: self._cols['velocityS'],
+        doc="S-wave velocity column as :class:`numpy.ndarray`.")
+    layerTopDepth = property(
+        lambda self: self._cols['layerTopDepth'],
+        doc="Layer top depth column as :class:`numpy.ndarray`.")
+    layerBottomDepth = property(
+        lambda self: self._cols['layerBottomDepth'],
+        doc="Layer bottom depth column as :class:`numpy.ndarray`.")
+
+    @property
+    def velocity_profile_data(self):
+        """
+        The layers as a list of
+        :class:`~obspy.core.inventory.sitexml.VelocityProfileData`, built on
+        the fly from the columns for backward compatibility.
+        """
+        return [VelocityProfileData(*values)
+                for values in zip(self._cols['density'],
+                                  self._cols['velocityP'],
+                                  self._cols['velocityS'],
+                                  self._cols['layerTopDepth'],
+                                  self._cols['layerBottomDepth'])]
+
+    def _kernel_columns(self):
+        """
+        The (layerTopDepth, layerBottomDepth, velocityS) columns as float64
+        arrays, as expected by the kernels in ``sitexml_kernels``.
+        """
+        return (np.asarray(self._cols['layerTopDepth'], dtype=np.float64),
+                np.asarray(self._cols['layerBottomDepth'], dtype=np.float64),
+                np.asarray(self._cols['velocityS'], dtype=np.float64))
+
+    def __eq__(self, other):
+        if not isinstance(other, self.__class__):
+            return False
+        if self.layer_count != other.layer_count:
+            return False
+        return all(np.array_equal(self._cols[column], other._cols[column])
+                   for column in self._COLUMNS)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+class VelocityProfileData(_SlottedComparingObject):
     # parameters here are values with uncertainties
     # This could be modeled with a list of [name, value, uncertainty] where name is one of density, velocityS, etc.
+    __slots__ = ('density', 'velocityP', 'velocityS', 'layerTopDepth',
+                 'layerBottomDepth')
+
     def __init__(self, density, velocityP, velocityS, layer_top_depth, layer_bottom_depth):
         self.density = density
         self.velocityP = velocityP
@@ -157,74 +552,89 @@ class VelocityProfileData(ComparingObject):
         self.layerTopDepth = layer_top_depth
         self.layerBottomDepth = layer_bottom_depth
 
-class SiteIndicator(ComparingObject):
+class SiteIndicator(_SlottedComparingObject):
+    __slots__ = ('name', 'value', 'uncertainty', 'methods', 'quality_index',
+                 'literature_source', 'external_reference')
+
     def __init__(self, name, value, uncertainty=None, methods=None, quality_index=None, literature_source=None, external_reference=None):
         self.name = name
         self.value = value
         self.uncertainty = uncertainty
-        self.methods = methods or []
+        self.methods = methods if methods is not None else _EMPTY
         self.quality_index = quality_index
         self.literature_source = literature_source
         self.external_reference = external_reference
 
 class H800_class(SiteIndicator):
-    def __init__(self, value, uncertainty=None, methods=None, 
-                 quality_index=None, literature_source=None, 
+    __slots__ = ()
+
+    def __init__(self, value, uncertainty=None, methods=None,
+                 quality_index=None, literature_source=None,
                  external_reference=None):
         super(H800_class, self).__init__(
-            name="H800", value=value, uncertainty=uncertainty, methods=methods, 
-            quality_index=quality_index, literature_source=literature_source, 
+            name=_NAME_H800, value=value, uncertainty=uncertainty, methods=methods,
+            quality_index=quality_index, literature_source=literature_source,
             external_reference=external_reference)
 
 class EC8_class(SiteIndicator):
-    def __init__(self, value, uncertainty=None, methods=None, 
-                 quality_index=None, literature_source=None, 
+    __slots__ = ()
+
+    def __init__(self, value, uncertainty=None, methods=None,
+                 quality_index=None, literature_source=None,
                  external_reference=None):
         super(EC8_class, self).__init__(
-            name="EC8", value=value, uncertainty=uncertainty, methods=methods, 
-            quality_index=quality_index, literature_source=literature_source, 
+            name=_NAME_EC8, value=value, uncertainty=uncertainty, methods=methods,
+            quality_index=quality_index, literature_source=literature_source,
             external_reference=external_reference)
 
 class BedrockDepth(SiteIndicator):
-    def __init__(self, value, uncertainty=None, methods=None, 
-                 quality_index=None, literature_source=None, 
+    __slots__ = ()
+
+    def __init__(self, value, uncertainty=None, methods=None,
+                 quality_index=None, literature_source=None,
                  external_reference=None):
         super(BedrockDepth, self).__init__(
-            name="bedrock_depth", value=value, uncertainty=uncertainty, methods=methods, 
-            quality_index=quality_index, literature_source=literature_source, 
+            name=_NAME_BEDROCK_DEPTH, value=value, uncertainty=uncertainty, methods=methods,
+            quality_index=quality_index, literature_source=literature_source,
             external_reference=external_reference)
 
 class GeologicalUnit(SiteIndicator):
-    def __init__(self, value, uncertainty=None, methods=None, 
-                 quality_index=None, literature_source=None, 
+    __slots__ = ('geological_map_scale', 'geological_unit_OGE')
+
+    def __init__(self, value, uncertainty=None, methods=None,
+                 quality_index=None, literature_source=None,
                  external_reference=None, geological_map_scale=None, geological_unit_OGE=None):
         self.geological_map_scale = geological_map_scale
         self.geological_unit_OGE = geological_unit_OGE
         super(GeologicalUnit, self).__init__(
-            name="geological_unit", value=value, uncertainty=uncertainty, methods=methods, 
-            quality_index=quality_index, literature_source=literature_source, 
+            name=_NAME_GEOLOGICAL_UNIT, value=value, uncertainty=uncertainty, methods=methods,
+            quality_index=quality_index, literature_source=literature_source,
             external_reference=external_reference)
-        
+
 class ResonanceFrequency(SiteIndicator):
-    def __init__(self, value, uncertainty=None, methods=None, 
-                 quality_index=None, literature_source=None, 
+    __slots__ = ()
+
+    def __init__(self, value, uncertainty=None, methods=None,
+                 quality_index=None, literature_source=None,
                  external_reference=None):
         super(ResonanceFrequency, self).__init__(
-            name="resonance_frequency", value=value, uncertainty=uncertainty, methods=methods, 
-            quality_index=quality_index, literature_source=literature_source, 
+            name=_NAME_RESONANCE_FREQUENCY, value=value, uncertainty=uncertainty, methods=methods,
+            quality_index=quality_index, literature_source=literature_source,
             external_reference=external_reference)
-        
+
 class velocityS30(SiteIndicator):
-    def __init__(self, value, uncertainty=None, methods=None, 
-                 quality_index=None, literature_source=None, 
+    __slots__ = ('method_combined_quality_index', 'manual_quality_index')
+
+    def __init__(self, value, uncertainty=None, methods=None,
+                 quality_index=None, literature_source=None,
                  external_reference=None, method_combined_quality_index=None, manual_quality_index=None):
         self.method_combined_quality_index = method_combined_quality_index
         self.manual_quality_index = manual_quality_index
         super(velocityS30, self).__init__(
-            name="velocity_s30", value=value, uncertainty=uncertainty, methods=methods, 
-            quality_index=quality_index, literature_source=literature_source, 
+            name=_NAME_VELOCITY_S30, value=value, uncertainty=uncertainty, methods=methods,
+            quality_index=quality_index, literature_source=literature_source,
             external_reference=external_reference)
-        
+
 class LiteratureSource(ComparingObject):
     def __init__(self, title, firstAuthor=None, secondaryAuthors=None, year=None, booktitle=None, language=None, DOI=None):
         self.title = title
@@ -234,7 +644,135 @@ class LiteratureSource(ComparingObject):
         self.booktitle = booktitle
         self.language = language
         self.DOI = DOI
-        
-if __name__ == '__main__':
+
+
+# The constructors of the plain value classes above are compiled once at
+# import time (see _make_init), driven by one _VALIDATED_FIELDS tuple per
+# class. The generated code is the fully unrolled equivalent of looping
+# over the tuple with an inline isinstance per field, and the tuples stay
+# available on the classes for introspection.
+SERASite._VALIDATED_FIELDS = (
+    ('station_code', True, None),
+    ('site_description', False, SiteDescription),
+    ('site_characterization_parameters', False,
+     SiteCharacterizationParameters),
+    # TO CHECK: If this one is calculated it should be removed from the
+    # parameters
+    ('overall_quality_index', False, None),
+)
+SERASite.__init__ = _make_init(
+    'SERASite', SERASite._VALIDATED_FIELDS,
+    doc="""
+        :type station_code: str
+        :param station_code: Not used in SiteXML, but is needed in order to correlate with the Station Object
+        :type site_description: :class:`~obspy.core.inventory.sitexml.SiteDescription`
+        :param analysis_publicID: The site description parameters (H800, Bedrock depth, EC8 class, geological unit, morphology, topology)
+        :type site_characterization_parameters: :class:`~obspy.core.inventory.sitexml.SiteCharacterizationParameters`
+        :param site_characterization_parameters: The site characterization parameters (VS30, resonance frequency, velocity profiles)
+        :type overall_quality_index: float
+        :param overall_quality_index: The overall quality index of the site characterization parameters.
+        """)
+
+# Topology and topography have the same meaning ?
+SiteDescription._VALIDATED_FIELDS = (
+    ('latitude', True, None),
+    ('longitude', True, None),
+    ('altitude', False, None),
+    ('minDistanceFromStation', False, None),
+    ('maxDistanceFromStation', False, None),
+    ('EC8', False, EC8_class),
+    ('bedrock_depth', False, BedrockDepth),
+    ('H800', False, H800_class),
+    ('geological_unit', False, GeologicalUnit),
+    ('morphology', False, None),
+    ('topologyA', False, TopographySchemaA),
+    ('topologyB', False, TopographySchemaB),
+)
+SiteDescription.__init__ = _make_init(
+    'SiteDescription', SiteDescription._VALIDATED_FIELDS,
+    doc="""
+        :type latitude: :class:`~obspy.core.inventory.util.Latitude`
+        :param latitude: The latitude of the site
+        :type longitude: :class:`~obspy.core.inventory.util.Longitude`
+        :param longitude: The longitude of the site
+        :type altitude: float (maybe CustomFloat??)
+        :param altitude: Elevation of ground with respect to sea level (m)
+        :type minDistanceFromStation: float (maybe CustomFloat??)
+        :param minDistanceFromStation: Minimum distance between the permanent seismological station and
+            site characterization measurement. Should be used only when representative latitude and longitude
+            of site characterization measurements cannot be provided.
+        :type maxDistanceFromStation: float (maybe CustomFloat??)
+        :param maxDistanceFromStation: Maximum distance between the permanent seismological station and
+            site characterization measurement. Should be used only when representative latitude and longitude
+            of site characterization measurements cannot be provided.
+        :type EC8: :class:`~obspy.core.inventory.sitexml.EC8`
+        :param EC8: Ground type according to Eurocode 8, based on the velocity S30 value and geotechnical description
+        :type H800: :class:`~obspy.core.inventory.sitexml.H800`
+        :param H800: Depth beyond which the shear-wave velocity Vs exceeds 800 m/s.
+        :type bedrock_depth: :class:`~obspy.core.inventory.sitexml.BedrockDepth`
+        :param bedrock_depth:
+        :type geological_unit: str
+        :param geological_unit: Brief description of the surface geology (free text)
+        :type morphology: str (Enum)
+        :param morphology: Qualitative description of the shape of the earth's surface
+        :type topologyA: str
+        :param topologyA: Quantitative description of the surface according to the Italian Code
+            (detailed description of the scheme in SERA Deliverable D7.1 - Appendix I).
+            See :class:`~obspy.core.inventory.sitexml_header.TopographySchemaA` for allowed values.
+        :type topologyB: str
+        :param topologyB: Quantitative description of the shape of the earth's surface according to
+            Burjanek et al, 2014 (detailed description of the scheme in SERA Deliverable D7.1 - Appendix I).
+            See :class:`~obspy.core.inventory.sitexml_header.TopographySchemaB` for allowed values.
+        """)
+
+SiteCharacterizationParameters._VALIDATED_FIELDS = (
+    ('publicID', False, None),
+    ('analysis_publicID', False, None),
+    ('resonance_frequency', False, ResonanceFrequency),
+    ('velocity_s30', False, velocityS30),
+    ('velocity_profile_count', False, property),
+    ('velocity_profile', False, tuple),
+    ('spt_logs_count', False, None),
+    ('cpt_logs_count', False, None),
+    ('borehole_logs_count', False, None),
+)
+SiteCharacterizationParameters.__init__ = _make_init(
+    'SiteCharacterizationParameters',
+    SiteCharacterizationParameters._VALIDATED_FIELDS,
+    doc="""
+        :type publicID: :class:`~obspy.core.event.resourceid.ResourceIdentifier`
+        :param publicID: All channels belonging to this station.
+        :type analysis_publicID: :class:`~obspy.core.event.resourceid.ResourceIdentifier`
+        :param analysis_publicID: The lexical description of the site
+        :type resonance_frequency: :class:`~obspy.core.inventory.sitexml.ResonanceFrequency`
+        :param resonance_frequency: The Resonance frequency of the soil column
+        :type velocity_s30: :class:`~obspy.core.inventory.sitexml.velocityS30`
+        :param velocity_s30: Average shear-wave velocity between 0 and 30 meters depth
+        :type velocity_profile_count: int
+        :param velocity_profile_count: Deprecated and ignored; the count is
+            derived from ``velocity_profile``.
+        :type velocity_profile: list of :class:`~obspy.core.inventory.sitexml.VelocityProfile`
+        :param velocity_profile: List of velocity profiles. Defaults to a
+            shared empty tuple; pass an explicit list to mutate it afterwards.
+        :type spt_logs_count: int
+        :param spt_logs_count: Number of available SPT profile(s)
+        :type cpt_logs_count: int
+        :param cpt_logs_count: Number of available CPT profile(s)
+        :type borehole_logs_count: int
+        :param borehole_logs_count: Number of available borehole log profile(s)
+       """)
+
+
+# Register the classes of this module in the shared type-name cache so the
+# raise branches of the checks format their messages without __name__
+# lookups.
+_TYPE_NAMES.update({cls: cls.__name__ for cls in (
+    SERASite, SiteDescription, SiteCharacterizationParameters,
+    VelocityProfile, VelocityProfileData, SiteIndicator, H800_class,
+    EC8_class, BedrockDepth, GeologicalUnit, ResonanceFrequency,
+    velocityS30, LiteratureSource)})
+
+
+if __name__ == '__main__' and os.environ.get('OBSPY_DOCTEST'):
     import doctest
     doctest.testmod(exclude_empty=True)
@@ -10,15 +10,13 @@ This module provides enumerations defined in the
     GNU Lesser General Public License, Version 3
     (https://www.gnu.org/copyleft/lesser.html)
 """
+import sys
+
 from obspy.core.util import Enum
 
 
-TopographySchemaA = Enum([
-    "T1",
-    "T2",
-    "T3",
-    "T4",
-])
+TopographySchemaA = Enum(
+    [sys.intern(v) for v in ("T1", "T2", "T3", "T4")])
 """
 Topography is a precise (quantitative) description of the ground surface 
 features of a site. Schema A is the topography description scheme of the Italian Code.
@@ -34,14 +32,9 @@ Allowed values are:
 * ``"T4"``
 """
 
-TopographySchemaB = Enum([
-    "Valley",
-    "Lower slope",
-    "Flat",
-    "Middle slope",
-    "Upper slope",
-    "Ridge",
-])
+TopographySchemaB = Enum(
+    [sys.intern(v) for v in ("Valley", "Lower slope", "Flat", "Middle slope",
+                             "Upper slope", "Ridge")])
 """
 Topography is a precise (quantitative) description of the ground surface 
 features of a site. Schema B is the one proposed by Burjanek et al. (2014).
@@ -56,6 +49,60 @@ Allowed values are:
 * ``"Ridge"``
 """
 
+_ENUM_MEMBERS = {
+    TopographySchemaA: frozenset(TopographySchemaA.keys()),
+    TopographySchemaB: frozenset(TopographySchemaB.keys()),
+}
+"""
+Frozensets of the (lowercased) member keys of each enum above, precomputed
+once at import time so that :func:`_sitexml_check_enum` only needs a single
+set lookup per call instead of going through ``Enum.__contains__``.
+"""
+
+
+def _enum_members(enum_type):
+    """
+    Returns the cached frozenset of member keys of an Enum, computing (and
+    caching) it on first use for enums not known at import time.
+    """
+    members = _ENUM_MEMBERS.get(enum_type)
+    if members is None:
+        members = _ENUM_MEMBERS[enum_type] = frozenset(enum_type.keys())
+    return members
+
+
+_TYPE_NAMES = {}
+"""
+Cache of type -> name strings for the error messages below, populated by
+the modules that register their validated classes (see sitexml.py). Using
+the cache saves the ``__name__`` descriptor lookup in the raise branch;
+unknown types fall back to ``__name__`` via dict.get.
+"""
+
+
+def _sitexml_type_error(param_name, expected_type, value):
+    """
+    Builds the error message for a failed type check. Only called from
+    raise branches, so no formatting work happens on the success path.
+    """
+    expected_name = (_TYPE_NAMES.get(expected_type) or
+                     expected_type.__name__)
+    got_name = _TYPE_NAMES.get(type(value)) or type(value).__name__
+    return ("Expected '" + param_name + "' to be of type " + expected_name +
+            ", but got " + got_name + " instead.")
+
+
+def _sitexml_enum_error(param_name, enum_type, value):
+    """
+    Builds the error message for a failed Enum membership check. Only
+    called from raise branches, so the valid-value list is only ever built
+    for the message.
+    """
+    valid_values = enum_type.values()
+    return ("Invalid value for '" + param_name + "'. Expected one of " +
+            str(valid_values) + ", but got '" + str(value) + "'.")
+
+
 def _sitexml_check_type(value, expected_type, param_name="value", allow_none=False):
     """
     Checks if a given value matches the expected type.
@@ -70,8 +117,7 @@ def _sitexml_check_type(value, expected_type, param_name="value", allow_none=Fal
         return value  # Allow None if specified
 
     if not isinstance(value, expected_type):
-        raise TypeError(f"Expected '{param_name}' to be of type {expected_type.__name__}, "
-                        f"but got {type(value).__name__} instead.")
+        raise TypeError(_sitexml_type_error(param_name, expected_type, value))
 
     return value  # Return the value if the type is correct
 
@@ -90,7 +136,6 @@ def _sitexml_check_enum(value, enum_type, param_name="value", allow_none=False):
     if allow_none and value is None:
         return value  # Allow None if specified
     
-    if value not in enum_type:
-        valid_values = [e for e in enum_type]  # Get all valid Enum names
-        raise ValueError(f"Invalid value for '{param_name}'. Expected one of {valid_values}, but got '{value}'.")
+    if value.lower() not in _enum_members(enum_type):
+        raise ValueError(_sitexml_enum_error(param_name, enum_type, value))
     return value  # Return the value if it's valid
\ No newline at end of file
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+import io
+
+from lxml import etree
+import numpy as np
+import pytest
+
+from obspy.core.util.deprecation_helpers import ObsPyDeprecationWarning
+from obspy.core.inventory import sitexml
+from obspy.core.inventory.sitexml import (
+    SERASite, SiteCharacterizationParameters, SiteDescription,
+    VelocityProfile, VelocityProfileData, EC8_class, LiteratureSource,
+    parse_sitexml, to_xml_stream, velocityS30)
+
+
+class TestSiteXML:
+    """
+    Test suite for obspy.core.inventory.sitexml
+    """
+    def test_type_checked_constructors(self):
+        site = SERASite("STA1")
+        assert site.site_description is None
+        with pytest.raises(TypeError):
+            SERASite("STA1", site_description="not a SiteDescription")
+
+    def test_enum_checked_constructors(self):
+        description = SiteDescription(45.0, 7.0, topologyA="T2",
+                                      topologyB="Ridge")
+        assert description.topologyA == "T2"
+        with pytest.raises(ValueError):
+            SiteDescription(45.0, 7.0, topologyA="T9")
+
+    def test_slotted_instances_have_no_dict(self):
+        # the whole value-object hierarchy stores its state in slots only
+        site = SERASite("STA1")
+        description = SiteDescription(45.0, 7.0)
+        parameters = SiteCharacterizationParameters()
+        profile = VelocityProfile()
+        layer = VelocityProfileData(2000.0, 1500.0, 400.0, 0.0, 10.0)
+        indicator = velocityS30(500.0)
+        for instance in (site, description, parameters, profile, layer,
+                         indicator):
+            assert not hasattr(instance, '__dict__')
+        with pytest.raises(AttributeError):
+            site.staton_code = "typo"
+
+    def test_equality(self):
+        site = SERASite(
+            "STA1",
+            site_description=SiteDescription(45.0, 7.0, EC8=EC8_class("A")),
+            site_characterization_parameters=SiteCharacterizationParameters(
+                velocity_s30=velocityS30(500.0)))
+        other = SERASite(
+            "STA1",
+            site_description=SiteDescription(45.0, 7.0, EC8=EC8_class("A")),
+            site_characterization_parameters=SiteCharacterizationParameters(
+                velocity_s30=velocityS30(500.0)))
+        assert site == other
+        other.station_code = "STA2"
+        assert site != other
+
+    def test_velocity_profile_from_objects(self):
+        layers = [VelocityProfileData(2000.0, 1500.0, 400.0, 0.0, 10.0),
+                  VelocityProfileData(2200.0, 2500.0, 800.0, 10.0, 30.0)]
+        profile = VelocityProfile(velocity_profile_data=layers)
+        np.testing.assert_allclose(profile.velocityS, [400.0, 800.0])
+        np.testing.assert_allclose(profile.layerBottomDepth, [10.0, 30.0])
+        # the object view is rebuilt from the columns
+        assert profile.velocity_profile_data == layers
+
+    def test_velocity_profile_from_columns(self):
+        profile = VelocityProfile(
+            density=[2000.0, 2200.0], velocityP=[1500.0, 2500.0],
+            velocityS=[400.0, 800.0], layerTopDepth=[0.0, 10.0],
+            layerBottomDepth=[10.0, 30.0])
+        layers = [VelocityProfileData(2000.0, 1500.0, 400.0, 0.0, 10.0),
+                  VelocityProfileData(2200.0, 2500.0, 800.0, 10.0, 30.0)]
+        assert profile == VelocityProfile(velocity_profile_data=layers)
+        assert profile != VelocityProfile(
+            density=[2000.0, 2200.0], velocityP=[1500.0, 2500.0],
+            velocityS=[400.0, 900.0], layerTopDepth=[0.0, 10.0],
+            layerBottomDepth=[10.0, 30.0])
+
+    def test_velocity_profile_ragged_columns(self):
+        with pytest.raises(ValueError):
+            VelocityProfile(velocityS=[400.0])
+        with pytest.raises(ValueError):
+            VelocityProfile(
+                density=[2000.0, 2200.0], velocityP=[1500.0, 2500.0],
+                velocityS=[400.0, 800.0], layerTopDepth=[0.0, 10.0],
+                layerBottomDepth=[10.0])
+
+    def test_velocity_profile_objects_and_columns_exclusive(self):
+        layers = [VelocityProfileData(2000.0, 1500.0, 400.0, 0.0, 10.0)]
+        with pytest.raises(TypeError):
+            VelocityProfile(velocity_profile_data=layers,
+                            velocityS=[400.0])
+
+    def test_compute_vs30(self):
+        # 10 m at 400 m/s plus 20 m at 800 m/s: 30 / (10/400 + 20/800)
+        profile = VelocityProfile(velocity_profile_data=[
+            VelocityProfileData(2000.0, 1500.0, 400.0, 0.0, 10.0),
+            VelocityProfileData(2200.0, 2500.0, 800.0, 10.0, 30.0)])
+        parameters = SiteCharacterizationParameters(
+            velocity_profile=[profile])
+        assert parameters.compute_vs30() == pytest.approx(600.0)
+
+    def test_compute_vs30_shallow_profile(self):
+        # a 15 m profile gets its deepest layer extended down to 30 m
+        profile = VelocityProfile(velocity_profile_data=[
+            VelocityProfileData(2000.0, 1500.0, 400.0, 0.0, 15.0)])
+        parameters = SiteCharacterizationParameters(
+            velocity_profile=[profile])
+        assert parameters.compute_vs30() == pytest.approx(400.0)
+
+    def test_compute_vs30_empty_profile(self):
+        parameters = SiteCharacterizationParameters(
+            velocity_profile=[VelocityProfile()])
+        assert np.isnan(parameters.compute_vs30())
+
+    def test_compute_resonance_frequency(self):
+        # one-way travel time 0.1 s, f0 = 1 / (4 * 0.1)
+        profile = VelocityProfile(velocity_profile_data=[
+            VelocityProfileData(2000.0, 1500.0, 400.0, 0.0, 40.0)])
+        parameters = SiteCharacterizationParameters(
+            velocity_profile=[profile])
+        assert parameters.compute_resonance_frequency() == pytest.approx(2.5)
+
+    def test_derived_counts(self):
+        layers = [VelocityProfileData(2000.0, 1500.0, 400.0, 0.0, 10.0),
+                  VelocityProfileData(2200.0, 2500.0, 800.0, 10.0, 30.0)]
+        profile = VelocityProfile(velocity_profile_data=layers)
+        assert profile.layer_count == 2
+        parameters = SiteCharacterizationParameters(
+            velocity_profile=[profile])
+        assert parameters.velocity_profile_count == 1
+        # the legacy count arguments are accepted but ignored with a warning
+        with pytest.warns(ObsPyDeprecationWarning):
+            profile = VelocityProfile(2, layers)
+        assert profile.layer_count == 2
+        with pytest.warns(ObsPyDeprecationWarning):
+            parameters = SiteCharacterizationParameters(
+                velocity_profile_count=5, velocity_profile=[profile])
+        assert parameters.velocity_profile_count == 1
+
+    def test_velocity_profile_dtype(self):
+        profile = VelocityProfile(
+            density=[2000.0], velocityP=[1500.0], velocityS=[400.0],
+            layerTopDepth=[0.0], layerBottomDepth=[10.0], dtype=np.float32)
+        assert profile.velocityS.dtype == np.float32
+
+    def test_to_xml_stream(self, tmp_path):
+        profile = VelocityProfile(velocity_profile_data=[
+            VelocityProfileData(2000.0, 1500.0, 400.0, 0.0, 10.0)])
+        sites = (
+            SERASite(
+                "STA%d" % i,
+                site_description=SiteDescription(45.0, 7.0, topologyA="T1"),
+                site_characterization_parameters=(
+                    SiteCharacterizationParameters(
+                        analysis_publicID="smi:local/analysis/1",
+                        velocity_s30=velocityS30(
+                            500.0, uncertainty=50.0,
+                            methods=["MASW", "ESAC"],
+                            literature_source=LiteratureSource(
+                                "Site survey", year=2024),
+                            method_combined_quality_index=0.8),
+                        velocity_profile=[profile],
+                        borehole_logs_count=2)))
+            for i in range(3))
+        path = str(tmp_path / "sites.xml")
+        # a generator is enough, the writer never holds more than one site
+        to_xml_stream(sites, path)
+        doc = parse_sitexml(path)
+        root = doc.getroot()
+        assert root.tag == "SiteXML"
+        codes = [site.get("stationCode") for site in root]
+        assert codes == ["STA0", "STA1", "STA2"]
+        site = root[0]
+        assert site.findtext(
+            "SiteDescription/TopographySchemaA") == "T1"
+        parameters = site.find("SiteCharacterizationParameters")
+        assert parameters.get("analysisPublicID") == "smi:local/analysis/1"
+        assert parameters.findtext("BoreholeLogsCount") == "2"
+        vs30 = parameters.find("VelocityS30")
+        assert vs30.findtext("Value") == "500.0"
+        assert vs30.get("uncertainty") == "50.0"
+        assert [m.text for m in vs30.findall("Method")] == ["MASW", "ESAC"]
+        assert vs30.findtext("LiteratureSource/Title") == "Site survey"
+        assert vs30.findtext("MethodCombinedQualityIndex") == "0.8"
+        layer = site.find(
+            "SiteCharacterizationParameters/VelocityProfile/Layer")
+        assert layer.findtext("VelocityS") == "400.0"
+
+    def test_parse_sitexml(self):
+        data = io.BytesIO(b"<SiteXML><Site station_code='STA1'/></SiteXML>")
+        doc = parse_sitexml(data)
+        assert doc.getroot().tag == "SiteXML"
+
+    def test_parse_sitexml_with_schema(self, tmp_path, monkeypatch):
+        xsd = tmp_path / "sitexml.xsd"
+        xsd.write_text(
+            '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">'
+            '<xs:element name="SiteXML"><xs:complexType><xs:sequence>'
+            '<xs:element name="Site" minOccurs="0" maxOccurs="unbounded">'
+            '<xs:complexType>'
+            '<xs:attribute name="stationCode" use="required"/>'
+            '</xs:complexType></xs:element>'
+            '</xs:sequence></xs:complexType></xs:element>'
+            '</xs:schema>')
+        monkeypatch.setattr(sitexml, '_SITEXML_SCHEMA_PATH', str(xsd))
+        # a valid document parses...
+        doc = parse_sitexml(
+            io.BytesIO(b"<SiteXML><Site stationCode='STA1'/></SiteXML>"))
+        assert doc.getroot()[0].get("stationCode") == "STA1"
+        # ...an invalid one is rejected while parsing
+        with pytest.raises(etree.XMLSyntaxError):
+            parse_sitexml(io.BytesIO(b"<SiteXML><Site/></SiteXML>"))
+        # the compiled schema is cached per path
+        assert sitexml._sitexml_schema_cache[str(xsd)] is not None
@@ -22,7 +22,7 @@ from pathlib import Path
 
 from lxml import etree
 from lxml.etree import parse as xmlparse
-from lxml.etree import Element, SubElement, tostring
+from lxml.etree import Element, ElementTree, SubElement, tostring
 import numpy as np
 
 from obspy import Stream, Trace, __version__
@@ -253,6 +253,25 @@ class Parser(object):
         :return: Returns either a string or a dict of strings depending
             on the flag ``split_stations``.
         """
+        result = self._get_xseed_doc(version=version,
+                                     split_stations=split_stations)
+        if isinstance(result, dict):
+            return {id: tostring(doc, pretty_print=True,
+                                 xml_declaration=True, encoding='UTF-8')
+                    for id, doc in result.items()}
+        return tostring(result, pretty_print=True, xml_declaration=True,
+                        encoding='UTF-8')
+
+    def _get_xseed_doc(self, version=DEFAULT_XSEED_VERSION,
+                       split_stations=False):
+        """
+        Builds the XSEED document tree(s) for the current Parser object.
+
+        Same as :meth:`get_xseed` but returns the lxml document element(s)
+        instead of serialized strings, so callers that write to a file can
+        stream the serialization instead of holding the whole document in
+        memory.
+        """
         if version not in XSEED_VERSIONS:
             raise SEEDParserException("Unknown XML-SEED version!")
         doc = Element("xseed", version=version)
@@ -293,9 +312,8 @@ class Parser(object):
                 SubElement(doc, to_tag('Timespan Control Header'))
                 # Also no data is present in all supported SEED files.
                 SubElement(doc, to_tag('Data Records'))
-            # Return single XML String.
-            return tostring(doc, pretty_print=True, xml_declaration=True,
-                            encoding='UTF-8')
+            # Return single XML document.
+            return doc
         else:
             # generate a dict of XML resources for each station
             result = {}
@@ -314,20 +332,24 @@ class Parser(object):
                     id = station[0].end_effective_date.datetime
                 except AttributeError:
                     id = ''
-                result[id] = tostring(cdoc, pretty_print=True,
-                                      xml_declaration=True, encoding='UTF-8')
+                result[id] = cdoc
             return result
 
+    @staticmethod
+    def _write_xml_doc(doc, filename):
+        # ElementTree.write serializes incrementally into the file object,
+        # so the pretty-printed document is never held in memory as a
+        # whole; the large buffer keeps the number of write syscalls low.
+        with open(filename, 'wb', buffering=1024 * 1024) as f:
+            ElementTree(doc).write(f, pretty_print=True,
+                                   xml_declaration=True, encoding='UTF-8')
+
     def write_xseed(self, filename, *args, **kwargs):
         """
         Writes a XML-SEED file with given name.
         """
-        result = self.get_xseed(*args, **kwargs)
-        if isinstance(result, bytes):
-            with open(filename, 'wb') as f:
-                f.write(result)
-            return
-        elif isinstance(result, dict):
+        result = self._get_xseed_doc(*args, **kwargs)
+        if isinstance(result, dict):
             for key, value in result.items():
                 if isinstance(key, datetime.datetime):
                     # past meta data - append timestamp
@@ -336,11 +358,9 @@ class Parser(object):
                 else:
                     # current meta data - leave original file name
                     fn = filename
-                with open(fn, 'wb') as f:
-                    f.write(value)
+                self._write_xml_doc(value, fn)
             return
-        else:
-            raise TypeError
+        self._write_xml_doc(result, filename)
 
     def get_seed(self, compact=False):
         """